@@ -12,8 +12,12 @@
 from __future__ import annotations
 
 import copy
+from functools import lru_cache
+from operator import itemgetter
+import re
 import typing as t
-from xml.etree.ElementTree import tostring as et_tostring
+from xml.etree.ElementTree import Comment, ProcessingInstruction, tostring as et_tostring
+from xml.sax.saxutils import escape as xmlEscape
 
 from music21 import common
 from music21 import meter
@@ -27,6 +31,25 @@ if t.TYPE_CHECKING:
     from music21.base import Music21Object
 
 
+# sort key for (name, value) attribute pairs: names are unique, so
+# comparing them alone gives the same order as comparing the whole tuples
+_attributeName = itemgetter(0)
+
+# escapes beyond &, <, and > that ElementTree applies to attribute values
+_ATTRIBUTE_ENTITIES = {'"': '&quot;', '\r': '&#13;', '\n': '&#10;', '\t': '&#09;'}
+
+# newline plus two spaces per level, for indent() and dumpString(); fixed,
+# so that threads never need to modify it.  See _indentString() for deeper levels.
+_INDENT_STRINGS: tuple[str, ...] = tuple('\n' + '  ' * level for level in range(32))
+
+# leading digits of a measure number, then any suffix ('23b' -> '23', 'b').
+# Not re.ASCII: Unicode \d is exactly the set of digits that int() accepts.
+_MEASURE_NUMBER_SUFFIX = re.compile(r'(\d*)(.*)', re.DOTALL)
+
+# MusicXML attribute name ('page-number') to music21 attribute name ('pageNumber')
+_CAMEL_CASE_CACHE: dict[str, str] = {}
+
+
 def dumpString(obj, *, noCopy=False) -> str:
     r'''
     wrapper around xml.etree.ElementTree that returns a string
@@ -44,20 +67,123 @@ def dumpString(obj, *, noCopy=False) -> str:
     True
     >>> dumpString(e)
     '<accidental>∆</accidental>'
+
+    Usually the string is written in a single pass over the tree, laid
+    out as :func:`indent` would lay it out, without modifying or copying
+    `obj`, whatever the value of `noCopy`:
+
+    >>> from xml.etree.ElementTree import fromstring as El
+    >>> e = El('<clef><sign>G</sign></clef>')
+    >>> dumpString(e, noCopy=True)
+    '<clef>\n  <sign>G</sign>\n</clef>'
+    >>> e.text is None
+    True
+
+    Trees that need ElementTree's own serializer (namespaced tags,
+    non-string values, and the like) are instead indented and sorted
+    with :func:`indent`: on a copy by default, but in place if `noCopy`
+    is True.
+
+    >>> e = El('<a xmlns:x="urn:x"><x:b/><c/></a>')
+    >>> print(dumpString(e, noCopy=True))
+    <a xmlns:ns0="urn:x">
+      <ns0:b />
+      <c />
+    </a>
+    >>> e.text
+    '\n  '
+    '''
+    parts: list[str] = []
+    try:
+        _serializeIndented(obj, 0, parts.append)
+        tail = obj.tail
+        if tail and not isinstance(tail, str):
+            raise _NotSerializableInOnePass
+    except _NotSerializableInOnePass:
+        # namespaces, non-string values, etc.: let ElementTree handle (or reject) them
+        return _dumpStringInPlace(obj if noCopy else copy.deepcopy(obj))
+    if tail:
+        # only the root's tail can leave trailing whitespace; trim it here
+        # rather than copying the whole string with .rstrip()
+        parts.append(xmlEscape(tail.rstrip()))
+    return ''.join(parts)
+
+
+class _NotSerializableInOnePass(Exception):
+    pass
+
+
+def _serializeIndented(elem, level: int, write: Callable[[str], t.Any]) -> None:
+    '''
+    Write `elem` and its descendants, but not its own tail, to `write`,
+    with the whitespace that :func:`indent` would give them at `level`
+    and with attributes sorted, without modifying anything.
+
+    Raises _NotSerializableInOnePass on anything that the plain
+    ElementTree serializer treats specially, such as namespaced tags.
+    '''
+    tag = elem.tag
+    if tag is Comment or tag is ProcessingInstruction:
+        if len(elem):
+            raise _NotSerializableInOnePass
+        write(('<!--%s-->' if tag is Comment else '<?%s?>') % elem.text)
+        return
+    if not isinstance(tag, str) or tag[:1] == '{':
+        raise _NotSerializableInOnePass
+
+    write('<' + tag)
+    items = elem.items()
+    if len(items) > 1:
+        items.sort(key=_attributeName)
+    for name, value in items:
+        if not isinstance(name, str) or name[:1] == '{' or not isinstance(value, str):
+            raise _NotSerializableInOnePass
+        write(f' {name}="{xmlEscape(value, _ATTRIBUTE_ENTITIES)}"')
+
+    text = elem.text
+    if text is not None and not isinstance(text, str):
+        raise _NotSerializableInOnePass
+    numChildren = len(elem)
+    if not numChildren:
+        if text:
+            write('>' + xmlEscape(text) + '</' + tag + '>')
+        else:
+            write(' />')
+        return
+
+    i = _indentString(level)
+    iChild = _indentString(level + 1)
+
+    if not text or not text.strip():
+        text = iChild
+    write('>' + xmlEscape(text))
+    lastIndex = numChildren - 1
+    for index, subElem in enumerate(elem):
+        _serializeIndented(subElem, level + 1, write)
+        if index == lastIndex:
+            write(i)
+            continue
+        tail = subElem.tail
+        if tail and not isinstance(tail, str):
+            raise _NotSerializableInOnePass
+        write(xmlEscape(tail) if tail and tail.strip() else iChild)
+    write('</' + tag + '>')
+
+
+def _dumpStringInPlace(xmlEl) -> str:
+    '''
+    Indent and sort the attributes of `xmlEl` in place and return it as
+    a string using ElementTree's own serializer.
     '''
-    if noCopy is False:
-        xmlEl = copy.deepcopy(obj)  # adds 5% overhead
-    else:
-        xmlEl = obj
     indent(xmlEl)  # adds 5% overhead
 
     for el in xmlEl.iter():
-        attrib = el.attrib
-        if len(attrib) > 1:
-            # adjust attribute order, e.g. by sorting
-            attribs = sorted(attrib.items())
-            attrib.clear()
-            attrib.update(attribs)
+        # adjust attribute order, e.g. by sorting, but leave already-sorted
+        # attributes (the usual case) untouched.  .keys() rather than .attrib,
+        # since reading .attrib creates an empty dict on every element without one.
+        keys = el.keys()
+        if len(keys) > 1 and keys != sorted(keys):
+            el.attrib = dict(sorted(el.items(), key=_attributeName))
     xStr = et_tostring(xmlEl, encoding='unicode')
     xStr = xStr.rstrip()
     return xStr
@@ -84,30 +210,62 @@ def dump(obj):
     print(dumpString(obj))
 
 
+def _indentString(level: int) -> str:
+    r'''
+    Return a newline followed by two spaces per `level`.
+
+    >>> musicxml.helpers._indentString(2)
+    '\n    '
+    >>> musicxml.helpers._indentString(40) == '\n' + '  ' * 40
+    True
+    '''
+    if level < len(_INDENT_STRINGS):
+        return _INDENT_STRINGS[level]
+    return '\n' + '  ' * level
+
+
 def indent(elem, level=0):
     '''
     helper method, indent an element in place:
+
+    Walks the tree with an explicit stack rather than by recursion, so
+    deeply nested trees do not pay for (or run out of) Python frames.
+    Each element sets the text of itself and the tails of its children;
+    the last child's tail dedents back to the parent's level.
+
+    >>> from xml.etree.ElementTree import fromstring as El, tostring
+    >>> root = El('<a><b><c/></b><d/></a>')
+    >>> musicxml.helpers.indent(root)
+    >>> print(tostring(root, encoding='unicode'))
+    <a>
+      <b>
+        <c />
+      </b>
+      <d />
+    </a>
+    <BLANKLINE>
     '''
-    i = '\n' + level * '  '
-    lenL = len(elem)
-    if lenL:
-        if not elem.text or not elem.text.strip():
-            elem.text = i + '  '
-        if not elem.tail or not elem.tail.strip():
-            elem.tail = i
+    if (level or len(elem)) and (not elem.tail or not elem.tail.strip()):
+        elem.tail = _indentString(level)
+
+    stack = [(elem, level)]
+    while stack:
+        parent, parentLevel = stack.pop()
+        if not len(parent):
+            continue
+        i = _indentString(parentLevel)
+        iChild = _indentString(parentLevel + 1)
+        if not parent.text or not parent.text.strip():
+            parent.text = iChild
 
         subElem = None
-        for subElem in elem:
-            indent(subElem, level + 1)
+        for subElem in parent:
+            if not subElem.tail or not subElem.tail.strip():
+                subElem.tail = iChild
+            stack.append((subElem, parentLevel + 1))
         if subElem is not None:  # last el
             subElem.tail = i
 
-        if not elem.tail or not elem.tail.strip():
-            elem.tail = '\n' + level * '  '
-    else:
-        if level and (not elem.tail or not elem.tail.strip()):
-            elem.tail = i
-
 
 def insertBeforeElements(root, insert, tagList=None):
     # noinspection PyShadowingNames
@@ -116,6 +274,10 @@ def insertBeforeElements(root, insert, tagList=None):
     of any instance of a child tag given in `tagList`. Append the element
     if `tagList` is `None`.
 
+    `tagList` may be any container of tag names; callers that run once
+    per note should pass a module-level frozenset, so that each child
+    is checked with a single hash lookup.
+
     >>> from xml.etree.ElementTree import fromstring as El
     >>> from music21.musicxml.helpers import insertBeforeElements, dump
     >>> root = El('<clef><sign>G</sign><line>4</line></clef>')
@@ -144,14 +306,40 @@ def insertBeforeElements(root, insert, tagList=None):
     if not tagList:
         root.append(insert)
         return
-    insertIndices = {len(root)}
-    # Iterate children only, not grandchildren
-    for i, child in enumerate(root.findall('*')):
+    insertIndex = len(root)
+    # Iterate children only, not grandchildren; the first match is the earliest
+    for i, child in enumerate(root):
         if child.tag in tagList:
-            insertIndices.add(i)
-    root.insert(min(insertIndices), insert)
+            insertIndex = i
+            break
+    root.insert(insertIndex, insert)
+
+
+@lru_cache(4096)
+def _splitMeasureNumberSuffix(measureNumber: str) -> tuple[str, str]:
+    '''
+    Split a measure number into its leading digits and any suffix.
+
+    >>> musicxml.helpers._splitMeasureNumberSuffix('23b')
+    ('23', 'b')
+    >>> musicxml.helpers._splitMeasureNumberSuffix('23')
+    ('23', '')
+
+    Any decimal digits count, since int() can read them, but other numeric
+    characters such as superscripts belong to the suffix:
+
+    >>> musicxml.helpers._splitMeasureNumberSuffix('\u0662\u0663a')
+    ('٢٣', 'a')
+    >>> musicxml.helpers._splitMeasureNumberSuffix('2\u00b2')
+    ('2', '²')
+    '''
+    m = _MEASURE_NUMBER_SUFFIX.match(measureNumber)
+    if t.TYPE_CHECKING:
+        assert m is not None  # the pattern matches every string
+    return m.group(1), m.group(2)
 
 
+@lru_cache(8192)
 def measureNumberComesBefore(mNum1: str, mNum2: str) -> bool:
     '''
     Determine whether `measureNumber1` strictly precedes
@@ -173,37 +361,45 @@ def measureNumberComesBefore(mNum1: str, mNum2: str) -> bool:
     True
     >>> measureNumberComesBefore('23b', '23b')
     False
-    '''
-    def splitSuffix(measureNumber):
-        number = ''
-        for char in measureNumber:
-            if char.isnumeric():
-                number += char
-            else:
-                break
-        suffix = measureNumber[len(number):]
-        return number, suffix
 
+    Numbers that differ only in leading zeros compare by suffix alone:
+
+    >>> measureNumberComesBefore('023', '23')
+    False
+    >>> measureNumberComesBefore('023a', '23b')
+    True
+    '''
     if mNum1 == mNum2:
         return False
-    m1Numeric, m1Suffix = splitSuffix(mNum1)
-    m2Numeric, m2Suffix = splitSuffix(mNum2)
+    m1Numeric, m1Suffix = _splitMeasureNumberSuffix(mNum1)
+    m2Numeric, m2Suffix = _splitMeasureNumberSuffix(mNum2)
     if int(m1Numeric) != int(m2Numeric):
         return int(m1Numeric) < int(m2Numeric)
     else:
-        sortedSuffixes = sorted([m1Suffix, m2Suffix])
-        return m1Suffix is sortedSuffixes[0]
+        return m1Suffix < m2Suffix
 
 
 def isFullMeasureRest(r: 'music21.note.Rest') -> bool:
-    isFullMeasure = False
-    if r.fullMeasure in (True, 'always'):
-        isFullMeasure = True
-    elif r.fullMeasure == 'auto':
-        tsContext = r.getContextByClass(meter.TimeSignature)
-        if tsContext and tsContext.barDuration.quarterLength == r.duration.quarterLength:
-            isFullMeasure = True
-    return isFullMeasure
+    '''
+    Return True if the rest should be exported as a whole-measure rest.
+    Only 'auto' rests need to look up the TimeSignature in context.
+
+    >>> r = note.Rest(quarterLength=3.0)
+    >>> m = stream.Measure([meter.TimeSignature('3/4'), r])
+    >>> musicxml.helpers.isFullMeasureRest(r)
+    True
+    >>> r.fullMeasure = False
+    >>> musicxml.helpers.isFullMeasureRest(r)
+    False
+    '''
+    fullMeasure = r.fullMeasure
+    if fullMeasure is True or fullMeasure == 'always':
+        return True
+    if fullMeasure != 'auto':
+        return False
+    tsContext = r.getContextByClass(meter.TimeSignature)
+    return (tsContext is not None
+            and tsContext.barDuration.quarterLength == r.duration.quarterLength)
 
 
 def synchronizeIdsToM21(element: ET.Element, m21Object: Music21Object):
@@ -273,22 +469,28 @@ def synchronizeIdsToXML(
     >>> e.get('id', 'no idea')
     'no idea'
     '''
-    # had to suppress type-checking because of spurious error on
-    #    e.get('id', 'no idea')
-    if not isinstance(m21Object, prebase.ProtoM21Object):
-        return
-    if not hasattr(m21Object, 'id'):
+    m21Id = (getattr(m21Object, 'id', None)
+             if isinstance(m21Object, prebase.ProtoM21Object)
+             else None)
+    if m21Id is None or not xmlObjects.isValidXSDID(m21Id):
         return
+    element.set('id', m21Id)
 
-    m21Id = m21Object.id  # type: ignore
 
-    if m21Id is None:
-        return
 
-    if not xmlObjects.isValidXSDID(m21Id):
-        return
-    element.set('id', m21Id)
+def _hyphenToCamelCase(xmlAttributeName: str) -> str:
+    '''
+    Memoized :func:`~music21.common.stringTools.hyphenToCamelCase` for the
+    small, fixed set of MusicXML attribute names.
 
+    >>> musicxml.helpers._hyphenToCamelCase('page-number')
+    'pageNumber'
+    '''
+    camelCase = _CAMEL_CASE_CACHE.get(xmlAttributeName)
+    if camelCase is None:
+        camelCase = common.hyphenToCamelCase(xmlAttributeName)
+        _CAMEL_CASE_CACHE[xmlAttributeName] = camelCase
+    return camelCase
 
 
 def setM21AttributeFromAttribute(
@@ -340,7 +542,7 @@ def setM21AttributeFromAttribute(
         value = transform(value)
 
     if attributeName is None:
-        attributeName = common.hyphenToCamelCase(xmlAttributeName)
+        attributeName = _hyphenToCamelCase(xmlAttributeName)
     setattr(m21El, attributeName, value)
 
 
@@ -387,7 +589,7 @@ def setXMLAttributeFromAttribute(
     'yes'
     '''
     if attributeName is None:
-        attributeName = common.hyphenToCamelCase(xmlAttributeName)
+        attributeName = _hyphenToCamelCase(xmlAttributeName)
 
     value = getattr(m21El, attributeName, None)
     if value is None:
@@ -73,6 +73,9 @@ environLocal = environment.Environment('musicxml.m21ToXml')
 synchronizeIds = helpers.synchronizeIdsToXML
 setAttributeFromAttribute = helpers.setXMLAttributeFromAttribute
 
+# children of <note> that must follow an <unpitched> tag
+_TAGS_AFTER_UNPITCHED = frozenset(['duration', 'type'])
+
 
 if t.TYPE_CHECKING:
     from music21.common.types import OffsetQL
@@ -726,9 +729,11 @@ class XMLExporterBase:
 
     def asBytes(self, noCopy=True) -> bytes:
         '''
-        returns the xmlRoot as a bytes object. If noCopy is True
-        (default), modifies the file for pretty-printing in place.  Otherwise,
-        make a copy.
+        returns the xmlRoot as a bytes object, pretty-printed.  `noCopy` is
+        passed on to :func:`~music21.musicxml.helpers.dumpString`: xmlRoot is
+        normally left unmodified either way, but if it needs ElementTree's own
+        serializer, noCopy=True (default) indents it in place rather than
+        indenting a copy.
         '''
         sio = io.BytesIO()
         sio.write(self.xmlHeader())
@@ -4559,7 +4564,7 @@ class MeasureExporter(XMLExporterBase):
         _setTagTextFromAttribute(up, mxUnpitched, 'display-step')
         _setTagTextFromAttribute(up, mxUnpitched, 'display-octave')
 
-        helpers.insertBeforeElements(mxNote, mxUnpitched, tagList=['duration', 'type'])
+        helpers.insertBeforeElements(mxNote, mxUnpitched, tagList=_TAGS_AFTER_UNPITCHED)
 
         return mxNote
 
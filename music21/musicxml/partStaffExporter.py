@@ -30,6 +30,14 @@ from music21 import stream
 from music21.musicxml import helpers
 from music21.musicxml.xmlObjects import MusicXMLExportException, MusicXMLWarning
 
+# children of <note> that must follow a <staff> tag
+_TAGS_AFTER_STAFF = frozenset(['beam', 'notations', 'lyric', 'play', 'sound'])
+# children of <note> that must follow a <voice> tag
+_TAGS_AFTER_VOICE = frozenset([
+    'type', 'dot', 'accidental', 'time-modification',
+    'stem', 'notehead', 'notehead-text', 'staff',
+])
+
 
 def addStaffTags(
     measure: Element,
@@ -85,9 +93,7 @@ def addStaffTags(
                 raise e
             mxStaff = Element('staff')
             mxStaff.text = str(staffNumber)
-            helpers.insertBeforeElements(tag, mxStaff,
-                                                 tagList=['beam', 'notations', 'lyric', 'play',
-                                                          'sound'])
+            helpers.insertBeforeElements(tag, mxStaff, tagList=_TAGS_AFTER_STAFF)
 
 
 class PartStaffExporterMixin:
@@ -730,14 +736,7 @@ class PartStaffExporterMixin:
             for elem in otherMeasure.findall('note'):
                 new_voice = Element('voice')
                 new_voice.text = '1'
-                helpers.insertBeforeElements(
-                    elem,
-                    new_voice,
-                    tagList=[
-                        'type', 'dot', 'accidental', 'time-modification',
-                        'stem', 'notehead', 'notehead-text', 'staff',
-                    ]
-                )
+                helpers.insertBeforeElements(elem, new_voice, tagList=_TAGS_AFTER_VOICE)
             maxVoices = 1
 
         # Create <backup>
@@ -793,14 +792,7 @@ class PartStaffExporterMixin:
                 else:
                     voice = Element('voice')
                     voice.text = str(maxVoices + 1)
-                    helpers.insertBeforeElements(
-                        elem,
-                        voice,
-                        tagList=[
-                            'type', 'dot', 'accidental', 'time-modification',
-                            'stem', 'notehead', 'notehead-text', 'staff'
-                        ]
-                    )
+                    helpers.insertBeforeElements(elem, voice, tagList=_TAGS_AFTER_VOICE)
             # Append to otherMeasure
             otherMeasure.append(elem)
 
@@ -12,6 +12,7 @@
 from __future__ import annotations
 
 from collections import OrderedDict
+from functools import lru_cache
 import re
 
 # these single-entity tags are bundled together.
@@ -216,10 +217,23 @@ def isValidXSDID(text):
     if not text:
         return False
 
-    if _NCNAME.match(text):
-        return True
-    else:
-        return False
+    return _isValidNCName(text)
+
+
+@lru_cache(65536)
+def _isValidNCName(text: str) -> bool:
+    '''
+    Cached regular-expression check behind :func:`isValidXSDID`.  A score
+    tends to reuse a small number of distinct ids across many objects.
+    Non-strings are rejected before reaching this function, so the
+    default (integer) ids of music21 objects do not fill the cache.
+
+    >>> musicxml.xmlObjects._isValidNCName('hel_lo')
+    True
+    >>> musicxml.xmlObjects._isValidNCName('hel:lo')
+    False
+    '''
+    return _NCNAME.match(text) is not None
 
 
 # ------------------------------------------------------------------------------